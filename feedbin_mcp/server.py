@@ -1,33 +1,247 @@
 """Feedbin MCP Server — exposes Feedbin RSS API as MCP tools."""
 
+import asyncio
+import base64
+import math
 import os
-import json
-from typing import Any
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from typing import Any, NamedTuple, TypeVar
 
 import httpx
+import msgspec
+import orjson
 from mcp.server.fastmcp import FastMCP
 
 BASE_URL = "https://api.feedbin.com/v2"
 
-mcp = FastMCP("feedbin")
+_URL_SUBS = f"{BASE_URL}/subscriptions.json"
+_URL_ENTRIES = f"{BASE_URL}/entries.json"
+_URL_UNREAD = f"{BASE_URL}/unread_entries.json"
+_URL_STARRED = f"{BASE_URL}/starred_entries.json"
+_URL_TAGS = f"{BASE_URL}/tags.json"
+_URL_TAGGINGS = f"{BASE_URL}/taggings.json"
+_URL_FEED_FMT = BASE_URL + "/feeds/{}.json"
+_URL_FEED_ENTRIES_FMT = BASE_URL + "/feeds/{}/entries.json"
+_URL_ENTRY_FMT = BASE_URL + "/entries/{}.json"
 
+# Upper bound on requests a single tool call keeps in flight; matches the
+# client's keep-alive pool size.
+_MAX_CONCURRENCY = 10
 
-def _client() -> httpx.AsyncClient:
+# Feedbin accepts at most this many IDs in one mark-read/star request.
+_MAX_IDS_PER_MUTATION = 1000
+
+# Mutation chunks in flight at once; kept lower than reads since each one makes
+# Feedbin update up to _MAX_IDS_PER_MUTATION rows.
+_MAX_CONCURRENT_MUTATIONS = 5
+
+_T = TypeVar("_T")
+
+
+def _basic_auth_header() -> str | None:
     email = os.environ.get("FEEDBIN_EMAIL")
     password = os.environ.get("FEEDBIN_PASSWORD")
     if not email or not password:
-        raise RuntimeError(
-            "FEEDBIN_EMAIL and FEEDBIN_PASSWORD environment variables must be set."
+        return None
+    return "Basic " + base64.b64encode(f"{email}:{password}".encode()).decode()
+
+
+# Built once at import; a missing credential is reported on the first tool call.
+_AUTH_HEADER = _basic_auth_header()
+
+# Shared client so keep-alive connections are reused across tool calls.
+_CLIENT: httpx.AsyncClient | None = None
+
+
+async def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None:
+        if _AUTH_HEADER is None:
+            raise RuntimeError(
+                "FEEDBIN_EMAIL and FEEDBIN_PASSWORD environment variables must be set."
+            )
+        _CLIENT = httpx.AsyncClient(
+            headers={
+                "Content-Type": "application/json; charset=utf-8",
+                "Accept-Encoding": "gzip, br",
+                "Authorization": _AUTH_HEADER,
+            },
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=60,
+            ),
         )
-    return httpx.AsyncClient(
-        auth=(email, password),
-        headers={"Content-Type": "application/json; charset=utf-8"},
-        timeout=30.0,
+    return _CLIENT
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    global _CLIENT
+    try:
+        yield
+    finally:
+        if _CLIENT is not None:
+            await _CLIENT.aclose()
+            _CLIENT = None
+
+
+# Tools return pre-serialized JSON text. They are registered with
+# structured_output=False so FastMCP doesn't also validate each result and embed
+# a second copy of it as {"result": ...} structured content.
+mcp = FastMCP("feedbin", lifespan=_lifespan)
+
+
+async def _gather_bounded(*aws: Awaitable[_T], limit: int = _MAX_CONCURRENCY) -> list[_T]:
+    """Like asyncio.gather, but with at most `limit` awaitables running at once."""
+    sem = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[_T]) -> _T:
+        async with sem:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+
+async def _mutate_entries(method: str, url: str, key: str, entry_ids: list[int]) -> None:
+    """Send entry_ids to a Feedbin state endpoint, split into allowed-size chunks."""
+    chunks = [
+        entry_ids[i:i + _MAX_IDS_PER_MUTATION]
+        for i in range(0, len(entry_ids), _MAX_IDS_PER_MUTATION)
+    ]
+    client = await _get_client()
+    responses = await _gather_bounded(
+        *(client.request(method, url, content=orjson.dumps({key: chunk})) for chunk in chunks),
+        limit=_MAX_CONCURRENT_MUTATIONS,
     )
+    for r in responses:
+        r.raise_for_status()
 
 
 def _fmt(data: Any) -> str:
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    """Pretty-print JSON; raw response bytes are parsed directly by orjson."""
+    if isinstance(data, (bytes, bytearray)):
+        data = orjson.loads(data)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _ack(key: str, ids: list[int]) -> str:
+    return orjson.dumps({"status": "ok", key: ids}).decode()
+
+
+async def _stream_body(url: str, params: dict[str, Any] | None = None) -> bytearray:
+    """GET url, reading the body in chunks into one growing buffer.
+
+    Avoids httpx holding the chunk list and a joined copy of a large body at
+    the same time; orjson and msgspec both decode a bytearray without copying.
+    """
+    client = await _get_client()
+    buf = bytearray()
+    async with client.stream("GET", url, params=params) as r:
+        r.raise_for_status()
+        async for chunk in r.aiter_bytes(65536):
+            buf.extend(chunk)
+    return buf
+
+
+class _CacheEntry(NamedTuple):
+    expires_at: float
+    etag: str
+    last_modified: str
+    body: str
+
+
+# Formatted bodies of idempotent GET resources, keyed by URL and kept in
+# LRU order.
+_CACHE_MAX_ENTRIES = 256
+_cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+
+# Fetches currently on the wire, so concurrent callers for a URL share one.
+_inflight: dict[str, asyncio.Task[str]] = {}
+
+
+async def _cached_get(url: str, ttl: float = 60.0, raw: bool = False) -> str:
+    """GET an idempotent resource, serving it from cache while fresh.
+
+    Stale entries are revalidated with If-None-Match / If-Modified-Since so an
+    unchanged resource costs a 304 rather than a full download. With ttl=0
+    every call revalidates, which still coalesces concurrent identical
+    requests. With raw=True the body is kept as sent instead of being parsed
+    and re-indented.
+    """
+    cached = _cache.get(url)
+    if cached is not None and cached.expires_at > time.monotonic():
+        _cache.move_to_end(url)
+        return cached.body
+
+    task = _inflight.get(url)
+    if task is None:
+        task = asyncio.create_task(_revalidate(url, ttl, raw))
+        _inflight[url] = task
+        task.add_done_callback(lambda _: _inflight.pop(url, None))
+    # Shield so one caller being cancelled doesn't cancel the shared fetch.
+    return await asyncio.shield(task)
+
+
+async def _revalidate(url: str, ttl: float, raw: bool) -> str:
+    cached = _cache.get(url)
+    headers = {}
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    client = await _get_client()
+    r = await client.get(url, headers=headers)
+    if cached is not None and r.status_code == 304:
+        entry = cached._replace(expires_at=time.monotonic() + ttl)
+    else:
+        r.raise_for_status()
+        entry = _CacheEntry(
+            expires_at=time.monotonic() + ttl,
+            etag=r.headers.get("ETag", ""),
+            last_modified=r.headers.get("Last-Modified", ""),
+            body=r.text if raw else _fmt(r.content),
+        )
+
+    _cache[url] = entry
+    _cache.move_to_end(url)
+    while len(_cache) > _CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+    return entry.body
+
+
+class Entry(msgspec.Struct):
+    """A Feedbin entry as returned by the entries endpoints."""
+
+    id: int
+    feed_id: int
+    title: str | None = None
+    url: str | None = None
+    extracted_content_url: str | None = None
+    author: str | None = None
+    content: str | None = None
+    summary: str | None = None
+    published: str | None = None
+    created_at: str | None = None
+
+
+_entries_decoder = msgspec.json.Decoder(list[Entry])
+_entries_encoder = msgspec.json.Encoder()
+
+
+def _ids_param(ids: list[int]) -> str:
+    """Comma-join IDs for an ids= query parameter in a single C call."""
+    return orjson.dumps(ids)[1:-1].decode()
+
+
+def _field_list(fields: str) -> list[str]:
+    return [f.strip() for f in fields.split(",") if f.strip()]
 
 
 # ---------------------------------------------------------------------------
@@ -35,7 +249,7 @@ def _fmt(data: Any) -> str:
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_subscriptions() -> str:
     """List all feed subscriptions in the Feedbin account.
 
@@ -47,23 +261,17 @@ async def get_subscriptions() -> str:
     - site_url: the website URL
     - created_at: when the subscription was added
     """
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/subscriptions.json")
-        r.raise_for_status()
-        return _fmt(r.json())
+    return await _cached_get(_URL_SUBS)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_feed(feed_id: int) -> str:
     """Get details for a specific feed by its feed_id.
 
     Args:
         feed_id: The numeric feed ID.
     """
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/feeds/{feed_id}.json")
-        r.raise_for_status()
-        return _fmt(r.json())
+    return await _cached_get(_URL_FEED_FMT.format(feed_id))
 
 
 # ---------------------------------------------------------------------------
@@ -71,8 +279,8 @@ async def get_feed(feed_id: int) -> str:
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
-async def get_unread_entries(page: int = 1, per_page: int = 50) -> str:
+@mcp.tool(structured_output=False)
+async def get_unread_entries(page: int = 1, per_page: int = 50, fields: str = "") -> str:
     """Get unread article entries from Feedbin.
 
     Returns a page of unread entries, each with fields like:
@@ -81,15 +289,47 @@ async def get_unread_entries(page: int = 1, per_page: int = 50) -> str:
     Args:
         page: Page number (default 1).
         per_page: Number of entries per page, max 100 (default 50).
+        fields: Comma-separated entry fields to return, e.g. "id,title,url".
+                Leave empty to return every field, including the full HTML content.
     """
     params: dict[str, Any] = {"read": "false", "page": page, "per_page": min(per_page, 100)}
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/entries.json", params=params)
+    client = await _get_client()
+    r = await client.get(_URL_ENTRIES, params=params)
+    r.raise_for_status()
+    if not fields:
+        return _fmt(r.content)
+    wanted = _field_list(fields)
+    return _fmt([{k: e[k] for k in wanted if k in e} for e in orjson.loads(r.content)])
+
+
+@mcp.tool(structured_output=False)
+async def get_all_unread_entries(max_pages: int = 10) -> str:
+    """Get all unread article entries in one call, fetching pages concurrently.
+
+    Returns up to max_pages * 100 unread entries as a single list. Prefer this
+    over paging through get_unread_entries when you need the whole backlog.
+
+    Args:
+        max_pages: Maximum number of 100-entry pages to fetch (default 10).
+    """
+    params: dict[str, Any] = {"read": "false", "per_page": 100}
+    client = await _get_client()
+    r = await client.get(_URL_ENTRIES, params={**params, "page": 1})
+    r.raise_for_status()
+    entries: list[Any] = orjson.loads(r.content)
+
+    record_count = int(r.headers.get("X-Feedbin-Record-Count", len(entries)))
+    pages = min(math.ceil(record_count / 100), max_pages)
+    responses = await _gather_bounded(
+        *(client.get(_URL_ENTRIES, params={**params, "page": p}) for p in range(2, pages + 1))
+    )
+    for r in responses:
         r.raise_for_status()
-        return _fmt(r.json())
+        entries.extend(orjson.loads(r.content))
+    return _fmt(entries)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_read_entries(page: int = 1, per_page: int = 50) -> str:
     """Get read (already-read) article entries from Feedbin.
 
@@ -100,13 +340,13 @@ async def get_read_entries(page: int = 1, per_page: int = 50) -> str:
         per_page: Number of entries per page, max 100 (default 50).
     """
     params: dict[str, Any] = {"read": "true", "page": page, "per_page": min(per_page, 100)}
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/entries.json", params=params)
-        r.raise_for_status()
-        return _fmt(r.json())
+    client = await _get_client()
+    r = await client.get(_URL_ENTRIES, params=params)
+    r.raise_for_status()
+    return _fmt(r.content)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_starred_entries(page: int = 1, per_page: int = 50) -> str:
     """Get starred (bookmarked) article entries from Feedbin.
 
@@ -117,19 +357,20 @@ async def get_starred_entries(page: int = 1, per_page: int = 50) -> str:
         per_page: Number of entries per page, max 100 (default 50).
     """
     params: dict[str, Any] = {"starred": "true", "page": page, "per_page": min(per_page, 100)}
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/entries.json", params=params)
-        r.raise_for_status()
-        return _fmt(r.json())
+    client = await _get_client()
+    r = await client.get(_URL_ENTRIES, params=params)
+    r.raise_for_status()
+    return _fmt(r.content)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_entries(
     page: int = 1,
     per_page: int = 50,
     since: str = "",
     feed_id: int = 0,
     ids: str = "",
+    fields: str = "",
 ) -> str:
     """Get article entries with optional filters.
 
@@ -142,6 +383,8 @@ async def get_entries(
                e.g. "2024-01-01T00:00:00.000000Z".
         feed_id: If non-zero, only return entries from this specific feed.
         ids: Comma-separated list of specific entry IDs to retrieve (max 100).
+        fields: Comma-separated entry fields to return, e.g. "id,title,url".
+                Leave empty to return every field, including the full HTML content.
     """
     params: dict[str, Any] = {"page": page, "per_page": min(per_page, 100)}
     if since:
@@ -149,17 +392,18 @@ async def get_entries(
     if ids:
         params["ids"] = ids
 
-    async with _client() as client:
-        if feed_id:
-            url = f"{BASE_URL}/feeds/{feed_id}/entries.json"
-        else:
-            url = f"{BASE_URL}/entries.json"
-        r = await client.get(url, params=params)
-        r.raise_for_status()
-        return _fmt(r.json())
+    if feed_id:
+        url = _URL_FEED_ENTRIES_FMT.format(feed_id)
+    else:
+        url = _URL_ENTRIES
+    entries = _entries_decoder.decode(await _stream_body(url, params))
+    if fields:
+        wanted = [f for f in _field_list(fields) if f in Entry.__struct_fields__]
+        return _fmt([{k: getattr(e, k) for k in wanted} for e in entries])
+    return msgspec.json.format(_entries_encoder.encode(entries), indent=2).decode()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_entry(entry_id: int) -> str:
     """Get the full details of a single entry by its ID.
 
@@ -168,10 +412,32 @@ async def get_entry(entry_id: int) -> str:
     Args:
         entry_id: The numeric entry ID.
     """
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/entries/{entry_id}.json")
+    return _fmt(await _stream_body(_URL_ENTRY_FMT.format(entry_id)))
+
+
+@mcp.tool(structured_output=False)
+async def get_entries_by_ids(entry_ids: list[int]) -> str:
+    """Get the full details of many entries at once.
+
+    Fetches entries 100 IDs per request, with requests issued concurrently.
+    Prefer this over calling get_entry repeatedly.
+
+    Args:
+        entry_ids: List of entry IDs to retrieve.
+    """
+    chunks = [entry_ids[i:i + 100] for i in range(0, len(entry_ids), 100)]
+    client = await _get_client()
+    responses = await _gather_bounded(
+        *(
+            client.get(_URL_ENTRIES, params={"ids": _ids_param(chunk), "per_page": 100})
+            for chunk in chunks
+        )
+    )
+    entries: list[Any] = []
+    for r in responses:
         r.raise_for_status()
-        return _fmt(r.json())
+        entries.extend(orjson.loads(r.content))
+    return _fmt(entries)
 
 
 # ---------------------------------------------------------------------------
@@ -179,50 +445,54 @@ async def get_entry(entry_id: int) -> str:
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_unread_entry_ids() -> str:
     """Get the list of all unread entry IDs.
 
     Returns a flat array of integer entry IDs that are currently unread.
     More efficient than fetching full entries when you just need counts or IDs.
     """
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/unread_entries.json")
-        r.raise_for_status()
-        return _fmt(r.json())
+    return await _cached_get(_URL_UNREAD, ttl=0, raw=True)
+
 
+@mcp.tool(structured_output=False)
+async def count_unread_entries() -> str:
+    """Get the number of unread entries without fetching them.
 
-@mcp.tool()
+    Returns an object with a single unread_count field.
+    """
+    client = await _get_client()
+    r = await client.get(_URL_ENTRIES, params={"read": "false", "per_page": 1})
+    r.raise_for_status()
+    record_count = r.headers.get("X-Feedbin-Record-Count")
+    if record_count is not None:
+        count = int(record_count)
+    else:
+        ids = await _cached_get(_URL_UNREAD, ttl=0, raw=True)
+        count = len(orjson.loads(ids))
+    return orjson.dumps({"unread_count": count}).decode()
+
+
+@mcp.tool(structured_output=False)
 async def mark_entries_read(entry_ids: list[int]) -> str:
     """Mark one or more entries as read.
 
     Args:
         entry_ids: List of entry IDs to mark as read.
     """
-    async with _client() as client:
-        r = await client.request(
-            "DELETE",
-            f"{BASE_URL}/unread_entries.json",
-            content=json.dumps({"unread_entries": entry_ids}),
-        )
-        r.raise_for_status()
-        return json.dumps({"status": "ok", "marked_read": entry_ids})
+    await _mutate_entries("DELETE", _URL_UNREAD, "unread_entries", entry_ids)
+    return _ack("marked_read", entry_ids)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def mark_entries_unread(entry_ids: list[int]) -> str:
     """Mark one or more entries as unread.
 
     Args:
         entry_ids: List of entry IDs to mark as unread.
     """
-    async with _client() as client:
-        r = await client.post(
-            f"{BASE_URL}/unread_entries.json",
-            content=json.dumps({"unread_entries": entry_ids}),
-        )
-        r.raise_for_status()
-        return json.dumps({"status": "ok", "marked_unread": entry_ids})
+    await _mutate_entries("POST", _URL_UNREAD, "unread_entries", entry_ids)
+    return _ack("marked_unread", entry_ids)
 
 
 # ---------------------------------------------------------------------------
@@ -230,50 +500,36 @@ async def mark_entries_unread(entry_ids: list[int]) -> str:
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_starred_entry_ids() -> str:
     """Get the list of all starred entry IDs.
 
     Returns a flat array of integer entry IDs that are currently starred.
     More efficient than fetching full entries when you just need counts or IDs.
     """
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/starred_entries.json")
-        r.raise_for_status()
-        return _fmt(r.json())
+    return await _cached_get(_URL_STARRED, ttl=0, raw=True)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def star_entries(entry_ids: list[int]) -> str:
     """Star (bookmark) one or more entries.
 
     Args:
         entry_ids: List of entry IDs to star.
     """
-    async with _client() as client:
-        r = await client.post(
-            f"{BASE_URL}/starred_entries.json",
-            content=json.dumps({"starred_entries": entry_ids}),
-        )
-        r.raise_for_status()
-        return json.dumps({"status": "ok", "starred": entry_ids})
+    await _mutate_entries("POST", _URL_STARRED, "starred_entries", entry_ids)
+    return _ack("starred", entry_ids)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def unstar_entries(entry_ids: list[int]) -> str:
     """Unstar (remove bookmark from) one or more entries.
 
     Args:
         entry_ids: List of entry IDs to unstar.
     """
-    async with _client() as client:
-        r = await client.request(
-            "DELETE",
-            f"{BASE_URL}/starred_entries.json",
-            content=json.dumps({"starred_entries": entry_ids}),
-        )
-        r.raise_for_status()
-        return json.dumps({"status": "ok", "unstarred": entry_ids})
+    await _mutate_entries("DELETE", _URL_STARRED, "starred_entries", entry_ids)
+    return _ack("unstarred", entry_ids)
 
 
 # ---------------------------------------------------------------------------
@@ -281,22 +537,16 @@ async def unstar_entries(entry_ids: list[int]) -> str:
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_tags() -> str:
     """Get all tags used to organise subscriptions in the Feedbin account."""
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/tags.json")
-        r.raise_for_status()
-        return _fmt(r.json())
+    return await _cached_get(_URL_TAGS)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_taggings() -> str:
     """Get all taggings — the mapping of which feeds belong to which tags."""
-    async with _client() as client:
-        r = await client.get(f"{BASE_URL}/taggings.json")
-        r.raise_for_status()
-        return _fmt(r.json())
+    return await _cached_get(_URL_TAGGINGS)
 
 
 # ---------------------------------------------------------------------------
@@ -305,6 +555,12 @@ async def get_taggings() -> str:
 
 
 def main() -> None:
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
     mcp.run()
 
 